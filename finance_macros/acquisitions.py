@@ -1,9 +1,11 @@
 # coding: utf-8
 """Acquisition budgeting."""
 import calendar
+from contextlib import contextmanager
 from datetime import date, datetime
 from enum import Enum
-from typing import List, Optional, Type, Callable, Any, Tuple, Union
+from functools import lru_cache
+from typing import List, Optional, Sequence, Type, Callable, Any, Tuple, Union, Iterator
 
 from dateutil.relativedelta import relativedelta
 
@@ -16,6 +18,7 @@ COLUMNS = {"Name": ("name", str, 0), "Startdatum": ("start_date", Optional[date]
            "Davon allokiert": ("budget_acquired", float, 5), "Entsprechend verfügbar": None,
            "Anteil": None, "Gewichtung": ("weight", int, 8), "Debug": (None, str, 9), }
 LIBRE_OFFICE_DATE_FORMAT = "%d.%m.%y"
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
 
 try:
     desktop = XSCRIPTCONTEXT.getDesktop()  # type: ignore
@@ -32,15 +35,22 @@ except NameError:
     pass  # running tests
 
 
+def _today() -> date:
+    """Return the current date (patched by tests for reproducible plannings)."""
+    return date.today()
+
+
 def _get_day_of_month_of_planning_date(planning_month: date, planning_day_of_month: int) -> int:
     """Return the day of month of the given planning date."""
-    day_count = calendar.monthrange(planning_month.year, planning_month.month)[1]
+    day_count = _DAYS_IN_MONTH[planning_month.month - 1] \
+        + (planning_month.month == 2 and calendar.isleap(planning_month.year))
     if planning_day_of_month > 0:
         return min(planning_day_of_month, day_count)
     return int(planning_day_of_month) if planning_day_of_month > 0 \
         else day_count + planning_day_of_month + 1
 
 
+@lru_cache(maxsize=512)
 def _get_next_planning_date(current_date: date, planning_day_of_month: int) -> date:
     """Return the next planning date after the given current date."""
     this_months_planning = date(year=current_date.year, month=current_date.month,
@@ -56,25 +66,36 @@ def _get_next_planning_date(current_date: date, planning_day_of_month: int) -> d
 
 def _planning_date_count_between(date1: date, date2: date, planning_day_of_month: int) -> int:
     """Return the number of planning dates between the two given dates."""
-    counter = 1 if date1.day == _get_day_of_month_of_planning_date(date1,
-                                                                   planning_day_of_month) else 0
-    planning_date = _get_next_planning_date(date1, planning_day_of_month)
-    while planning_date <= date2:
-        counter += 1
-        planning_date = _get_next_planning_date(planning_date, planning_day_of_month)
+    first_planning_day = _get_day_of_month_of_planning_date(date1, planning_day_of_month)
+    counter = 1 if date1.day == first_planning_day else 0
+    # count the planning dates after date1 by month index instead of stepping through dates
+    first_month = 12 * date1.year + date1.month
+    last_month = 12 * date2.year + date2.month
+    if last_month == first_month:
+        return counter + (date1.day < first_planning_day <= date2.day)
+    if last_month > first_month:
+        last_planning_day = _get_day_of_month_of_planning_date(date2, planning_day_of_month)
+        counter += (first_planning_day > date1.day) + (last_month - first_month - 1) \
+            + (last_planning_day <= date2.day)
     return counter
 
 
-class BaseAcquisition:
+class BaseAcquisition:  # pylint: disable=too-many-instance-attributes
     """A base class for all acquisitions."""
 
+    __slots__ = ("name", "start_budget", "_target_budget", "_budget_acquired",
+                 "_remaining_budget", "start_date", "target_date", "weight")
+
     name: str
     start_budget: float
-    target_budget: float
-    budget_acquired: float
+    _target_budget: float
+    _budget_acquired: float
     start_date: Optional[date]
     target_date: Optional[date]
     weight: int
+    # budget still needed to reach the target budget,
+    # kept in sync with `target_budget` and `budget_acquired`
+    _remaining_budget: float
 
     # pylint: disable=too-many-arguments
     def __init__(self, name: str, start_budget: float, target_budget: float,
@@ -83,12 +104,32 @@ class BaseAcquisition:
                  weight: int, ):
         self.name = name
         self.start_budget = start_budget
-        self.target_budget = target_budget
+        self._target_budget = target_budget
         self.budget_acquired = self.start_budget
         self.start_date = start_date
         self.target_date = target_date
         self.weight = weight
 
+    @property
+    def target_budget(self) -> float:
+        """Budget this acquisition should reach."""
+        return self._target_budget
+
+    @target_budget.setter
+    def target_budget(self, value: float):
+        self._target_budget = value
+        self._remaining_budget = value - self._budget_acquired
+
+    @property
+    def budget_acquired(self) -> float:
+        """Budget allocated to this acquisition so far."""
+        return self._budget_acquired
+
+    @budget_acquired.setter
+    def budget_acquired(self, value: float):
+        self._budget_acquired = value
+        self._remaining_budget = self._target_budget - value
+
     def request_budget(
             self,
             planning_date: Optional[date] = None
@@ -98,11 +139,16 @@ class BaseAcquisition:
             return 0
         if self.start_date and planning_date and self.start_date > planning_date:
             return 0
-        return self.target_budget - self.budget_acquired
+        return self._remaining_budget
 
     def allocate_budget(self, budget: float):
         """Allocate budget to this acquisition."""
-        self.budget_acquired += budget
+        self._budget_acquired += budget
+        self._remaining_budget = self._target_budget - self._budget_acquired
+
+    def reset(self):
+        """Discard all allocations, falling back to the start budget."""
+        self.budget_acquired = self.start_budget
 
     def __str__(self):
         return f"{self.name}(\
@@ -131,10 +177,10 @@ weight={self.weight})"
         return self.start_date if self.start_date else 0
 
 
-class BasePlanning:
+class BasePlanning:  # pylint: disable=too-many-instance-attributes
     """A base class for all plannings, regardless of their mode."""
 
-    acquisitions: List[BaseAcquisition]
+    acquisitions: Sequence[BaseAcquisition]
     monthly_budget: float
     sum_of_weights: int
     # to allocate to all acquisitions as a starting budget depending on their weight
@@ -145,11 +191,12 @@ class BasePlanning:
     today: date  # for testing
     _planning_dates: List[date]
     planning_day_of_month: int
+    _snapshot: Optional[Tuple[float, ...]]  # budgets acquired as of the last snapshot()
 
     # pylint: disable=too-many-arguments
     def __init__(
             self,
-            acquisitions: List[BaseAcquisition],
+            acquisitions: Sequence[BaseAcquisition],
             monthly_budget: float,
             start_budget: float,
             today: Optional[date] = None,
@@ -159,9 +206,59 @@ class BasePlanning:
         self.monthly_budget = monthly_budget
         self.sum_of_weights = sum(acquisition.weight for acquisition in self.acquisitions)
         self.start_budget = start_budget
-        self.today = today or date.today()
+        self.today = today or _today()
         self._planning_dates = []
         self.planning_day_of_month = planning_day_of_month
+        self._snapshot = None
+
+    @property
+    def total_target_budget(self) -> float:
+        """Sum of the target budgets of all acquisitions."""
+        return sum(acquisition.target_budget for acquisition in self.acquisitions)
+
+    @property
+    def total_acquired_budget(self) -> float:
+        """Sum of the budgets acquired by all acquisitions so far."""
+        return sum(acquisition.budget_acquired for acquisition in self.acquisitions)
+
+    def reset(self):
+        """Discard all allocations of all acquisitions, falling back to their start budgets."""
+        for acquisition in self.acquisitions:
+            acquisition.reset()
+
+    def _acquired_budgets(self) -> Tuple[float, ...]:
+        return tuple(acquisition.budget_acquired for acquisition in self.acquisitions)
+
+    def snapshot(self) -> Tuple[float, ...]:
+        """Remember the budgets acquired by all acquisitions for a later restore()."""
+        self._snapshot = self._acquired_budgets()
+        return self._snapshot
+
+    def restore(self, snapshot: Optional[Tuple[float, ...]] = None):
+        """Reset the budgets acquired by all acquisitions to the given (or last) snapshot,
+        or to their start budgets if no snapshot was taken."""
+        if snapshot is None:
+            snapshot = self._snapshot
+        if snapshot is None:
+            self.reset()
+            return
+        if len(snapshot) != len(self.acquisitions):
+            raise ValueError(f"Snapshot of {len(snapshot)} budgets doesn't match "
+                             f"{len(self.acquisitions)} acquisitions")
+        for acquisition, budget_acquired in zip(self.acquisitions, snapshot):
+            acquisition.budget_acquired = budget_acquired
+
+    @contextmanager
+    def fresh(self) -> Iterator["BasePlanning"]:
+        """Run a block against the planning, restoring the acquired budgets, `today` and the
+        planning dates afterwards."""
+        snapshot = self._acquired_budgets()
+        today, planning_dates = self.today, self._planning_dates
+        try:
+            yield self
+        finally:
+            self.restore(snapshot)
+            self.today, self._planning_dates = today, planning_dates
 
     def sum_of_relevant_weights_at_planning_date(self, planning_date: date):
         """Return the sum of weights of all acquisitions that are relevant
@@ -181,6 +278,15 @@ class BasePlanning:
         """Calculate the acquired budgets for all acquisitions at the `today` date."""
         raise NotImplementedError
 
+    def compute_at(self, today: date) -> Tuple[float, ...]:
+        """Return the budgets all acquisitions would have acquired at the given date,
+        leaving the planning and its acquisitions untouched."""
+        with self.fresh():
+            self.reset()
+            self.today = today
+            self.calculate_acquired_budgets()
+            return self._acquired_budgets()
+
     def get_earliest_planning_date(self) -> Optional[date]:
         """Return the earliest relevant planning date for this planning."""
         earliest_start_date = min(acquisition.start_date for acquisition in  # type: ignore
@@ -226,6 +332,9 @@ class BasePlanningWeightedMonthlyContribution(BasePlanning):
         if budget == 0:
             return
         remaining_budget = budget
+        # collected in the same pass so the extra budget round doesn't need to walk
+        # all acquisitions again (see `sum_of_relevant_weights_at_planning_date`)
+        sum_of_relevant_weights = 0
         for acquisition in self.acquisitions:
             if acquisition.start_date and acquisition.start_date > planning_date:
                 continue
@@ -238,11 +347,13 @@ class BasePlanningWeightedMonthlyContribution(BasePlanning):
                 budget_to_allocate = min(remaining_budget, available_budget, requested_budget)
                 acquisition.allocate_budget(budget_to_allocate)
                 remaining_budget -= budget_to_allocate
+                requested_budget = acquisition.request_budget(planning_date)
+            if requested_budget:
+                sum_of_relevant_weights += acquisition.weight
         if 0 < remaining_budget < budget:
             # needs to be recalculated if extra_budget is available as some acquisition is fully
             # funded and therefore doesn't apply anymore
-            self.allocate_budget(remaining_budget, planning_date,
-                                 self.sum_of_relevant_weights_at_planning_date(planning_date))
+            self.allocate_budget(remaining_budget, planning_date, sum_of_relevant_weights)
 
     def allocate_planning_start_budget(self, budget: float):
         """Allocate the planning's start budget to all acquisitions, depending on their weight."""
@@ -420,11 +531,27 @@ class BasePlanningTargetDate(BasePlanning):
         acqs = list(filter(lambda a: a.target_date is None or a.start_date is None, acquisitions))
         return sum(map(lambda a: a.request_budget(planning_date), acqs)), acqs
 
-    def allocate_budget(self, budget: float, planning_date: date) -> float:
+    def _acquisitions_by_weight(self) -> List[Tuple[BaseAcquisition, int]]:
+        """Return the acquisitions by descending weight, paired with their (at least one)
+        number of planning dates until their target date."""
+        return [
+            (acq, acq.planning_dates_until_target_date(self.planning_day_of_month) or 1)
+            for acq in sorted(self.acquisitions, key=lambda a: a.weight, reverse=True)
+        ]
+
+    def allocate_budget(
+            self,
+            budget: float,
+            planning_date: date,
+            acquisitions_by_weight: Optional[List[Tuple[BaseAcquisition, int]]] = None
+    ) -> float:
         """Allocate a one-time budget (e.g. of a month or a starting budget).
-        The remaining (extra, more than could be allocated) budget is returned."""
+        The remaining (extra, more than could be allocated) budget is returned.
+        `acquisitions_by_weight` may be passed in to reuse it across planning dates."""
         remaining_budget = budget
-        acquisitions = sorted(self.acquisitions, key=lambda a: a.weight, reverse=True)
+        if acquisitions_by_weight is None:
+            acquisitions_by_weight = self._acquisitions_by_weight()
+        acquisitions = [acq for acq, _ in acquisitions_by_weight]
         immediate_allocation_budget, immediate_acquisitions = self. \
             immediate_allocation_required(acquisitions, planning_date)
 
@@ -435,11 +562,8 @@ class BasePlanningTargetDate(BasePlanning):
                                  planning.sum_of_relevant_weights_at_planning_date(self.today))
         remaining_budget -= budget_to_allocate
 
-        for acq in acquisitions:
+        for acq, num_planning_dates in acquisitions_by_weight:
             requested = acq.request_budget(planning_date)
-            num_planning_dates = acq.planning_dates_until_target_date(self.planning_day_of_month)
-            if num_planning_dates is None or num_planning_dates == 0:
-                num_planning_dates = 1
             if acq.start_date:
                 allocation_deficit = \
                     (acq.target_budget - acq.start_budget) / num_planning_dates \
@@ -462,17 +586,21 @@ class BasePlanningTargetDate(BasePlanning):
         return remaining_budget
 
     def calculate_acquired_budgets(self):
+        # weights and target dates don't change during a single calculation
+        acquisitions_by_weight = self._acquisitions_by_weight()
         earliest_planning_date = self.get_earliest_planning_date()
         extra_budget = self.allocate_budget(
-            self.start_budget, earliest_planning_date if earliest_planning_date else self.today
+            self.start_budget, earliest_planning_date if earliest_planning_date else self.today,
+            acquisitions_by_weight
         )
         value = self.call_at_each_planning_date(
-            lambda planning_date: self.allocate_budget(self.monthly_budget, planning_date)
+            lambda planning_date: self.allocate_budget(self.monthly_budget, planning_date,
+                                                       acquisitions_by_weight)
         )
         if value is not None:
             extra_budget += value
         if extra_budget:
-            self.allocate_budget(extra_budget, self.today)
+            self.allocate_budget(extra_budget, self.today, acquisitions_by_weight)
 
 
 class SpreadsheetAcquisition(BaseAcquisition):
@@ -591,9 +719,7 @@ start_budget={self.start_budget})"
 
     def write_sum_of_acquired_budgets(self):
         """Write the sum of acquired budgets to the spreadsheet."""
-        sum_of_acquired_budgets = sum(
-            acquisition.budget_acquired for acquisition in self.acquisitions)
-        ALREADY_ALLOCATED_WITHOUT_PLANNING_START_BUDGET_CELL.setValue(sum_of_acquired_budgets)
+        ALREADY_ALLOCATED_WITHOUT_PLANNING_START_BUDGET_CELL.setValue(self.total_acquired_budget)
 
 
 class SpreadsheetPlanningWeightedMonthlyContribution(SpreadsheetPlanning,
@@ -7,6 +7,8 @@ NET_WORTH_COLUMN = 5
 DEPOT_VALUE_COLUMN = 6
 NOT_IN_DEPOT_COLUMN = 7
 FIRST_DATA_ROW = 63
+# spreadsheet date values count days from 1899-12-30
+_EPOCH_OFFSET = datetime.date(year=1899, month=12, day=30).toordinal()
 
 try:
     # pylint: disable=undefined-variable
@@ -26,8 +28,7 @@ def _get_date_value(row: int) -> str:
 
 
 def _date_value(date: datetime.date) -> int:
-    delta = date - datetime.date(year=1900, month=1, day=1)
-    return delta.days + 2
+    return date.toordinal() - _EPOCH_OFFSET
 
 
 def snapshot_net_worth(*args):  # pylint: disable=invalid-name,unused-argument
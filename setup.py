@@ -10,6 +10,8 @@ requirements = [
     "mypy",
     "pytest",
     "pytest-cov",
+    "pytest-benchmark",
+    "pytest-xdist",
     "python-dateutil",
     "jupyter",
     "pandas",
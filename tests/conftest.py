@@ -0,0 +1,29 @@
+import datetime
+from typing import Optional
+
+import pytest
+
+import finance_macros.acquisitions
+from finance_macros.acquisitions import BaseAcquisition
+
+TODAY = datetime.date(2023, 3, 15)
+DEFAULT_START_DATE = datetime.date(2023, 1, 1)
+
+
+@pytest.fixture(autouse=True)
+def fixed_today(monkeypatch):
+    """Plannings created without an explicit `today` plan up to `TODAY`."""
+    monkeypatch.setattr(finance_macros.acquisitions, "_today", lambda: TODAY)
+
+
+@pytest.fixture
+def make_ac():
+    """Return a factory for acquisitions that only needs the fields differing from the
+    defaults."""
+
+    def _make(name: str = "test", start_budget: float = 0, target_budget: float = 100,
+              start_date: Optional[datetime.date] = DEFAULT_START_DATE,
+              target_date: Optional[datetime.date] = None, weight: int = 1) -> BaseAcquisition:
+        return BaseAcquisition(name, start_budget, target_budget, start_date, target_date, weight)
+
+    return _make
@@ -1,6 +1,9 @@
 from datetime import date, timedelta
+from operator import attrgetter
 from typing import Optional
 
+import pytest
+
 from finance_macros.acquisitions import (
     BaseAcquisition,
     BasePlanningWeightedMonthlyContribution,
@@ -13,867 +16,315 @@ from finance_macros.acquisitions import (
     _planning_date_count_between
 )
 
-
-def reset(*acquisitions):
-    for a in acquisitions:
-        a.budget_acquired = a.start_budget
+_D_20230101 = date(2023, 1, 1)
+_D_20230115 = date(2023, 1, 15)
+_D_20230120 = date(2023, 1, 20)
+_D_20230131 = date(2023, 1, 31)
+_D_20230201 = date(2023, 2, 1)
+_D_20230220 = date(2023, 2, 20)
+_D_20230228 = date(2023, 2, 28)
+_D_20230301 = date(2023, 3, 1)
+_D_20230315 = date(2023, 3, 15)
+_D_20230515 = date(2023, 5, 15)
+_D_20230615 = date(2023, 6, 15)
+_D_20231231 = date(2023, 12, 31)
+_D_20240101 = date(2024, 1, 1)
+_AC_ANCHOR = _D_20230101
+# start dates for the day offsets `ac` is called with
+_AC_START_DATES = {days: _AC_ANCHOR + timedelta(days=days) for days in range(4)}
 
 
 def ac(name: str, target_budget: float, weight: int, days: int,
        target_date: Optional[date] = None) -> BaseAcquisition:
-    anchor = date(2023, 1, 1)
-    return BaseAcquisition(
-        name, 0, target_budget, anchor + timedelta(days=days),
-        target_date, weight
-    )
+    start_date = _AC_START_DATES.get(days) or _AC_ANCHOR + timedelta(days=days)
+    return BaseAcquisition(name, 0, target_budget, start_date, target_date, weight)
+
+
+def plan_wmc(acquisitions, monthly_budget: float, start_budget: float,
+             today: Optional[date] = None) -> BasePlanningWeightedMonthlyContribution:
+    planning = BasePlanningWeightedMonthlyContribution(acquisitions, monthly_budget,
+                                                       start_budget, today)
+    planning.calculate_acquired_budgets()
+    return planning
+
+
+_GET_BUDGET_ACQUIRED = attrgetter("budget_acquired")
+_GET_START_BUDGET = attrgetter("start_budget")
 
 
 def _sum_acquired_budgets(*acquisitions: BaseAcquisition):
-    return sum(acquisition.budget_acquired for acquisition in acquisitions)
+    return sum(map(_GET_BUDGET_ACQUIRED, acquisitions))
 
 
 def _sum_start_budgets(*acquisitions: BaseAcquisition):
-    return sum(acquisition.start_budget for acquisition in acquisitions)
+    return sum(map(_GET_START_BUDGET, acquisitions))
 
 
-def assert_round(a: float, b: float):
-    assert round(a, 2) == round(b, 2), f"{a} != {b}"
+def assert_budgets(acquisitions, expected):
+    assert tuple(map(_GET_BUDGET_ACQUIRED, acquisitions)) == pytest.approx(expected, abs=0.005)
 
 
-def test_acquisition():
-    acquisition = BaseAcquisition(
-        name="test",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    assert acquisition.request_budget(date(2023, 1, 1)) == 100
+def test_acquisition(make_ac):
+    acquisition = make_ac()
+    assert acquisition.request_budget(_D_20230101) == 100
     acquisition.allocate_budget(50)
-    assert acquisition.request_budget(date(2023, 1, 1)) == 50
+    assert acquisition.request_budget(_D_20230101) == 50
     assert acquisition.budget_acquired == 50
 
 
-def test_wmcplanning_allocate_budget_single_acquisition():
-    acquisition = BaseAcquisition(
-        name="test",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    today = date(2023, 1, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition], monthly_budget=10, start_budget=0, today=today
-    )
-    planning.allocate_budget(planning.monthly_budget, date(2023, 1, 1), 1)
-    assert acquisition.budget_acquired == 10
+def test_acquisition_has_slots():
+    assert not hasattr(BaseAcquisition("test", 0, 1, _D_20230101, None, 1), "__dict__")
 
 
-def test_wmcplanning_calculate_acquired_budgets_doesnt_start_on_today():
-    acquisition = BaseAcquisition(
-        name="test",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    today = date(2022, 1, 1)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition], monthly_budget=10, start_budget=0, today=today
-    )
-    planning.calculate_acquired_budgets()
-    assert acquisition.budget_acquired == 0
+def test_acquisition_reset():
+    a = BaseAcquisition("test", 20, 100, _D_20230101, None, 1)
+    a.allocate_budget(30)
+    assert a.request_budget() == 50
+    a.reset()
+    assert a.budget_acquired == 20
+    assert a.request_budget() == 80
 
 
-def test_wmcplanning_calculate_acquired_budgets_does_start_on_first_day_in_past():
-    acquisition = BaseAcquisition(
-        name="test",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    today = date(2023, 1, 2)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition], monthly_budget=10, start_budget=0, today=today
-    )
-    planning.calculate_acquired_budgets()
-    assert acquisition.budget_acquired == 10
+def test_acquisition_target_budget_change_updates_request(make_ac):
+    a = make_ac(start_budget=20)
+    a.target_budget = 150
+    assert a.request_budget() == 130
 
 
-def test_wmcplanning_calculate_acquired_budgets_does_start_on_first_day_when_after_start_date():
-    acquisition = BaseAcquisition(
-        name="test",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2023, 1, 27),
-        target_date=None, weight=1,
-    )
-    today = date(2023, 2, 1)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition], monthly_budget=10, start_budget=0, today=today
-    )
-    planning.calculate_acquired_budgets()
+def test_wmcplanning_allocate_budget_single_acquisition(make_ac):
+    acquisition = make_ac()
+    today = _D_20230115
+    planning = BasePlanningWeightedMonthlyContribution((acquisition,), 10, 0, today)
+    planning.allocate_budget(planning.monthly_budget, _D_20230101, 1)
     assert acquisition.budget_acquired == 10
 
 
-def test_wmcplanning_calculate_acquired_budgets_single_acquisition_before_start():
-    acquisition = BaseAcquisition(
-        name="test",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    today = date(2022, 12, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition], monthly_budget=10, start_budget=0, today=today
-    )
-    planning.calculate_acquired_budgets()
-    assert acquisition.budget_acquired == 0
-
-
-def test_wmcplanning_calculate_acquired_budgets_single_acquisition_interim():
-    acquisition = BaseAcquisition(
-        name="test",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    today = date(2023, 3, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition], monthly_budget=10, start_budget=0, today=today
-    )
-    planning.calculate_acquired_budgets()
-    assert acquisition.budget_acquired == 30
-
-
-def test_wmcplanning_calculate_acquired_budgets_single_acquisition_after_end():
-    acquisition = BaseAcquisition(
-        name="test",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    today = date(2023, 6, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition], monthly_budget=20, start_budget=0, today=today
-    )
-    planning.calculate_acquired_budgets()
-    assert acquisition.budget_acquired == 100
-
-
-def test_wmcplanning_calculate_acquired_budgets_two_acquisitions_before_start():
-    acquisition1 = BaseAcquisition(
-        name="test1",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    acquisition2 = BaseAcquisition(
-        name="test2",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    today = date(2022, 12, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition1, acquisition2],
-        monthly_budget=10,
-        start_budget=0,
-        today=today,
-    )
-    planning.calculate_acquired_budgets()
-    assert acquisition1.budget_acquired == 0
-    assert acquisition2.budget_acquired == 0
-
-
-def test_wmcplanning_calculate_acquired_budgets_two_acquisitions_interim():
-    acquisition1 = BaseAcquisition(
-        name="test1",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2022, 11, 15),
-        target_date=None, weight=1,
-    )
-    acquisition2 = BaseAcquisition(
-        name="test2",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=3,
-    )
-    today = date(2023, 3, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition1, acquisition2],
-        monthly_budget=10,
-        start_budget=0,
-        today=today,
-    )
-    planning.calculate_acquired_budgets()
-    assert acquisition1.budget_acquired == 17.5
-    assert acquisition2.budget_acquired == 22.5
-
-
-def test_wmcplanning_calculate_acquired_budgets_two_acquisitions_after_end_uses_extra_budget():
-    acquisition1 = BaseAcquisition(
-        name="test1",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2022, 11, 15),
-        target_date=None, weight=1,
-    )
-    acquisition2 = BaseAcquisition(
-        name="test2",
-        start_budget=0,
-        target_budget=500,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=3,
-    )
-    today = date(2023, 7, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition1, acquisition2],
-        monthly_budget=40,
-        start_budget=0,
-        today=today,
-    )
-    planning.calculate_acquired_budgets()
-    assert acquisition1.budget_acquired == 100
-    assert acquisition2.budget_acquired == 220
-
-
-def test_wmcplanning_calculate_acquired_budgets_three_acquisitions_interim_uses_extra_budget():
-    acquisition1 = BaseAcquisition(
-        name="test1",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2022, 11, 15),
-        target_date=None, weight=1,
-    )
-    acquisition2 = BaseAcquisition(
-        name="test2",
-        start_budget=0,
-        target_budget=50,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=2,
-    )
-    acquisition3 = BaseAcquisition(
-        name="test3",
-        start_budget=0,
-        target_budget=500,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=3,
-    )
-    today = date(2023, 3, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition1, acquisition2, acquisition3],
-        monthly_budget=60,
-        start_budget=0,
-        today=today,
-    )
-    planning.calculate_acquired_budgets()
-    assert acquisition1.budget_acquired == 92.5
-    assert acquisition2.budget_acquired == 50
-    assert acquisition3.budget_acquired == 97.5
-
-
-def test_wmcplanning_calculate_acquired_budgets_three_acquisitions_interim():
-    acquisition1 = BaseAcquisition(
-        name="test1",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2022, 11, 15),
-        target_date=None, weight=1,
-    )
-    acquisition2 = BaseAcquisition(
-        name="test2",
-        start_budget=0,
-        target_budget=50,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=2,
-    )
-    acquisition3 = BaseAcquisition(
-        name="test3",
-        start_budget=0,
-        target_budget=500,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=3,
-    )
-    today = date(2023, 4, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition1, acquisition2, acquisition3],
-        monthly_budget=60,
-        start_budget=0,
-        today=today,
-    )
-    planning.calculate_acquired_budgets()
-    assert acquisition1.budget_acquired == 100
-    assert acquisition2.budget_acquired == 50
-    assert acquisition3.budget_acquired == 150
-
-
-def test_wmcplanning_calculate_acquired_budgets_three_acquisitions_after_end():
-    acquisition1 = BaseAcquisition(
-        name="test1",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2022, 11, 15),
-        target_date=None, weight=1,
-    )
-    acquisition2 = BaseAcquisition(
-        name="test2",
-        start_budget=0,
-        target_budget=50,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=2,
-    )
-    acquisition3 = BaseAcquisition(
-        name="test3",
-        start_budget=0,
-        target_budget=500,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=3,
-    )
-    today = date(2023, 7, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition1, acquisition2, acquisition3],
-        monthly_budget=60,
-        start_budget=0,
-        today=today,
-    )
-    planning.calculate_acquired_budgets()
-    assert acquisition1.budget_acquired == 100
-    assert acquisition2.budget_acquired == 50
-    assert acquisition3.budget_acquired == 330
-    assert _sum_acquired_budgets(acquisition1, acquisition2, acquisition3) == 480
-
-
-def test_wmcplanning_allocates_start_budget():
-    acquisition1 = BaseAcquisition(
-        name="test1",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2022, 9, 1),
-        target_date=None, weight=1,
-    )
-    acquisition2 = BaseAcquisition(
-        name="test2",
-        start_budget=0,
-        target_budget=50,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=2,
-    )
-    today = date(2023, 3, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition1, acquisition2],
-        monthly_budget=10,
-        start_budget=30,
-        today=today,
-    )
-    planning.allocate_planning_start_budget(planning.start_budget)
-    assert acquisition1.budget_acquired == 10
-    assert acquisition2.budget_acquired == 20
-    assert acquisition1.start_budget == 0
-    assert acquisition2.start_budget == 0
-    assert _sum_acquired_budgets(acquisition1, acquisition2) == planning.start_budget
-
-
-def test_wmcplanning_allocates_start_budget_applies_extra_budget():
-    acquisition1 = BaseAcquisition(
-        name="test1",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2022, 9, 1),
-        target_date=None, weight=1,
-    )
-    acquisition2 = BaseAcquisition(
-        name="test2",
-        start_budget=0,
-        target_budget=10,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=2,
-    )
-    today = date(2023, 3, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition1, acquisition2],
-        monthly_budget=10,
-        start_budget=30,
-        today=today,
-    )
+# (start_budget, target_budget, start_date, weight) per acquisition
+_THREE_ACQUISITIONS = [(0, 100, date(2022, 11, 15), 1), (0, 50, _D_20230101, 2),
+                       (0, 500, _D_20230101, 3)]
+
+
+@pytest.mark.parametrize("acquisitions_spec, monthly_budget, today, expected", [
+    pytest.param([(0, 100, _D_20230101, 1)], 10, date(2022, 1, 1), [0],
+                 id="doesnt_start_on_today"),
+    pytest.param([(0, 100, _D_20230101, 1)], 10, date(2023, 1, 2), [10],
+                 id="does_start_on_first_day_in_past"),
+    pytest.param([(0, 100, date(2023, 1, 27), 1)], 10, _D_20230201, [10],
+                 id="does_start_on_first_day_when_after_start_date"),
+    pytest.param([(0, 100, _D_20230101, 1)], 10, date(2022, 12, 15), [0],
+                 id="single_acquisition_before_start"),
+    pytest.param([(0, 100, _D_20230101, 1)], 10, _D_20230315, [30],
+                 id="single_acquisition_interim"),
+    pytest.param([(0, 100, _D_20230101, 1)], 20, _D_20230615, [100],
+                 id="single_acquisition_after_end"),
+    pytest.param([(0, 100, _D_20230101, 1), (0, 100, _D_20230101, 1)], 10,
+                 date(2022, 12, 15), [0, 0], id="two_acquisitions_before_start"),
+    pytest.param([(0, 100, date(2022, 11, 15), 1), (0, 100, _D_20230101, 3)], 10,
+                 _D_20230315, [17.5, 22.5], id="two_acquisitions_interim"),
+    pytest.param([(0, 100, date(2022, 11, 15), 1), (0, 500, _D_20230101, 3)], 40,
+                 date(2023, 7, 15), [100, 220],
+                 id="two_acquisitions_after_end_uses_extra_budget"),
+    pytest.param(_THREE_ACQUISITIONS, 60, _D_20230315, [92.5, 50, 97.5],
+                 id="three_acquisitions_interim_uses_extra_budget"),
+    pytest.param(_THREE_ACQUISITIONS, 60, date(2023, 4, 15), [100, 50, 150],
+                 id="three_acquisitions_interim"),
+    pytest.param(_THREE_ACQUISITIONS, 60, date(2023, 7, 15), [100, 50, 330],
+                 id="three_acquisitions_after_end"),
+    pytest.param([(50, 100, _D_20230115, 1)], 10, _D_20230120, [50],
+                 id="uses_start_budgets_before_first_planning_date"),
+    pytest.param([(50, 100, _D_20230101, 1)], 10, _D_20230315, [80],
+                 id="allocates_start_budget_long_term"),
+])
+def test_wmcplanning_calculate_acquired_budgets(make_ac, acquisitions_spec, monthly_budget,
+                                                today, expected):
+    acquisitions = [
+        make_ac(f"test{i}", start_budget, target_budget, start_date, weight=weight)
+        for i, (start_budget, target_budget, start_date, weight) in enumerate(acquisitions_spec, 1)
+    ]
+    plan_wmc(acquisitions, monthly_budget, 0, today)
+    assert [a.budget_acquired for a in acquisitions] == expected
+    assert [a.start_budget for a in acquisitions] == [spec[0] for spec in acquisitions_spec]
+
+
+@pytest.mark.parametrize("target_budgets, start_budget, expected, expected_total", [
+    pytest.param((100, 50), 30, (10, 20), 30, id="by_weight"),
+    pytest.param((100, 10), 30, (20, 10), 30, id="applies_extra_budget"),
+    pytest.param((50, 50), 150, (50, 50), 100, id="handles_satisfied_acquisitions"),
+])
+def test_wmcplanning_allocates_start_budget(make_ac, target_budgets, start_budget, expected,
+                                            expected_total):
+    acquisition1 = make_ac(name="test1", target_budget=target_budgets[0],
+                           start_date=date(2022, 9, 1))
+    acquisition2 = make_ac(name="test2", target_budget=target_budgets[1], weight=2)
+    planning = BasePlanningWeightedMonthlyContribution((acquisition1, acquisition2), 10,
+                                                       start_budget)
     planning.allocate_planning_start_budget(planning.start_budget)
-    assert acquisition1.budget_acquired == 20
-    assert acquisition2.budget_acquired == 10
-    assert acquisition1.start_budget == 0
-    assert acquisition2.start_budget == 0
-    assert _sum_acquired_budgets(acquisition1, acquisition2) == planning.start_budget
-
-
-def test_wmcplanning_allocate_start_budget_handles_satisfied_acquisitions():
-    acquisition1 = BaseAcquisition(
-        name="test1",
-        start_budget=0,
-        target_budget=50,
-        start_date=date(2022, 9, 1),
-        target_date=None, weight=1,
-    )
-    acquisition2 = BaseAcquisition(
-        name="test2",
-        start_budget=0,
-        target_budget=50,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=2,
-    )
-    today = date(2023, 3, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition1, acquisition2],
-        monthly_budget=10,
-        start_budget=150,
-        today=today,
-    )
-    planning.allocate_planning_start_budget(planning.start_budget)
-    assert acquisition1.budget_acquired == 50
-    assert acquisition2.budget_acquired == 50
-    assert acquisition1.start_budget == 0
-    assert acquisition2.start_budget == 0
-    assert _sum_acquired_budgets(acquisition1, acquisition2) == 100
-
-
-def test_wmcplanning_allocate_start_budget_handles_satisfied_acquisitions_complex():
-    ac1 = BaseAcquisition(
-        name="test1",
-        start_budget=0,
-        target_budget=500,
-        start_date=date(2022, 9, 1),
-        target_date=None, weight=1,
-    )
-    ac2 = BaseAcquisition(
-        name="test2",
-        start_budget=0,
-        target_budget=50,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=2,
-    )
-    ac3 = BaseAcquisition(
-        name="test3",
-        start_budget=10,
-        target_budget=200,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    today = date(2023, 3, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[ac1, ac2, ac3],
-        monthly_budget=10,
-        start_budget=200,
-        today=today,
-    )
-    planning.allocate_planning_start_budget(planning.start_budget)
-    assert ac1.budget_acquired == 75
-    assert ac2.budget_acquired == 50
-    assert ac3.budget_acquired == 85
-    assert ac1.start_budget == 0
-    assert ac2.start_budget == 0
-    assert ac3.start_budget == 10
-    assert _sum_acquired_budgets(ac1, ac2, ac3) == planning.start_budget + 10
-
-
-def test_wmcplanning_uses_start_budgets_before_first_planning_date():
-    acquisition = BaseAcquisition(
-        name="test",
-        start_budget=50,
-        target_budget=100,
-        start_date=date(2023, 1, 15),
-        target_date=None, weight=1,
-    )
-    today = date(2023, 1, 20)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition],
-        monthly_budget=10,
-        start_budget=0,
-        today=today,
-    )
-    planning.calculate_acquired_budgets()
-    assert acquisition.budget_acquired == 50
-    assert acquisition.start_budget == 50
-
-
-def test_wmcplanning_allocates_start_budget_long_term():
-    acquisition = BaseAcquisition(
-        name="test",
-        start_budget=50,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    today = date(2023, 3, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition],
-        monthly_budget=10,
-        start_budget=0,
-        today=today,
-    )
-    planning.calculate_acquired_budgets()
-    assert acquisition.budget_acquired == 80
-    assert acquisition.start_budget == 50
+    assert (acquisition1.budget_acquired, acquisition2.budget_acquired) == expected
+    assert (acquisition1.start_budget, acquisition2.start_budget) == (0, 0)
+    assert planning.total_acquired_budget == expected_total
 
 
-def test_wmcplanning_end_to_end_simple():
-    acquisition1 = BaseAcquisition(
-        name="test1",
-        start_budget=50,
-        target_budget=200,
-        start_date=date(2022, 12, 1),
-        target_date=None, weight=1,
-    )
-    acquisition2 = BaseAcquisition(
-        name="test2",
-        start_budget=100,
-        target_budget=500,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=4,
-    )
-    today = date(2023, 3, 15)
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=[acquisition1, acquisition2],
-        monthly_budget=50,
-        start_budget=100,
-        today=today,
-    )
-    planning.calculate_acquired_budgets()
-    assert acquisition1.budget_acquired == 150
-    assert acquisition2.budget_acquired == 300
-    assert acquisition1.start_budget == 50
-    assert acquisition2.start_budget == 100
+def test_wmcplanning_allocate_start_budget_handles_satisfied_acquisitions_complex(make_ac):
+    ac1 = make_ac(name="test1", target_budget=500, start_date=date(2022, 9, 1))
+    ac2 = make_ac(name="test2", target_budget=50, weight=2)
+    ac3 = make_ac(name="test3", start_budget=10, target_budget=200)
+    planning = BasePlanningWeightedMonthlyContribution((ac1, ac2, ac3), 10, 200)
+    planning.allocate_planning_start_budget(planning.start_budget)
+    assert (ac1.budget_acquired, ac2.budget_acquired, ac3.budget_acquired) == (75, 50, 85)
+    assert (ac1.start_budget, ac2.start_budget, ac3.start_budget) == (0, 0, 10)
+    assert planning.total_acquired_budget == planning.start_budget + 10
+
+
+def test_wmcplanning_end_to_end_simple(make_ac):
+    acquisition1 = make_ac(name="test1", start_budget=50, target_budget=200,
+                           start_date=date(2022, 12, 1))
+    acquisition2 = make_ac(name="test2", start_budget=100, target_budget=500, weight=4)
+    planning = plan_wmc((acquisition1, acquisition2), 50, 100)
+    assert (acquisition1.budget_acquired, acquisition2.budget_acquired) == (150, 300)
+    assert (acquisition1.start_budget, acquisition2.start_budget) == (50, 100)
+    start_budget1, start_budget2 = acquisition1.start_budget, acquisition2.start_budget
+    planning_start_budget = planning.start_budget
     assert (
-            _sum_acquired_budgets(acquisition1, acquisition2)
-            == acquisition1.start_budget
-            + acquisition2.start_budget
-            + planning.start_budget
-            + 50 * 4
+            planning.total_acquired_budget
+            == start_budget1 + start_budget2 + planning_start_budget + 50 * 4
     )
 
 
-def test_wmcplanning_no_negative_allocations():
-    a = BaseAcquisition("test", 0, 100, date(2023, 1, 1), None, 1)
-    planning = BasePlanningWeightedMonthlyContribution([a], 50, -10, date(2023, 1, 1))
-    planning.calculate_acquired_budgets()
+def test_wmcplanning_no_negative_allocations(make_ac):
+    a = make_ac()
+    plan_wmc((a,), 50, -10, _D_20230101)
 
     assert a.budget_acquired == 50
     assert a.start_budget == 0
 
 
-def test_end_to_end_complex():
-    ac1 = BaseAcquisition(
-        name="1",
-        start_budget=0,
-        target_budget=1500,
-        start_date=date(2023, 2, 24),
-        target_date=None, weight=2,
-    )
-    ac2 = BaseAcquisition(
-        name="2",
-        start_budget=50,
-        target_budget=1000,
-        start_date=date(2023, 2, 24),
-        target_date=None, weight=1,
-    )
-    ac3 = BaseAcquisition(
-        name="3",
-        start_budget=0,
-        target_budget=350,
-        start_date=date(2023, 3, 10),
-        target_date=None, weight=10,
-    )
-    ac4 = BaseAcquisition(
-        name="4",
-        start_budget=0,
-        target_budget=1000,
-        start_date=date(2023, 3, 19),
-        target_date=None, weight=2,
-    )
-    ac5 = BaseAcquisition(
-        name="5",
-        start_budget=0,
-        target_budget=800,
-        start_date=date(2023, 3, 24),
-        target_date=None, weight=1,
-    )
+_EXPECTED_COMPLEX = (
+    328.64 * 2 / 3 + 1000 * 2 / 16 + 275 * 2 / 6,
+    328.64 / 3 + 1000 / 16 + 275 / 6 + 50,
+    350,
+    1000 * 2 / 16 + 275 * 2 / 6,
+    1000 / 16 + 275 / 6,
+)
+
+
+def test_end_to_end_complex(make_ac, benchmark):
+    ac1 = make_ac(name="1", target_budget=1500, start_date=date(2023, 2, 24), weight=2)
+    ac2 = make_ac(name="2", start_budget=50, target_budget=1000, start_date=date(2023, 2, 24))
+    ac3 = make_ac(name="3", target_budget=350, start_date=date(2023, 3, 10), weight=10)
+    ac4 = make_ac(name="4", target_budget=1000, start_date=date(2023, 3, 19), weight=2)
+    ac5 = make_ac(name="5", target_budget=800, start_date=date(2023, 3, 24))
     today = date(2023, 3, 24)
-    acs = [ac1, ac2, ac3, ac4, ac5]
-    planning = BasePlanningWeightedMonthlyContribution(
-        acquisitions=acs,
-        monthly_budget=328.64,
-        start_budget=1000,
-        today=today,
-    )
-    planning.calculate_acquired_budgets()
-    assert_round(ac1.budget_acquired, 328.64 * 2 / 3 + 1000 * 2 / 16 + 275 * 2 / 6)
-    assert_round(ac2.budget_acquired, 328.64 / 3 + 1000 / 16 + 275 / 6 + 50)
-    assert_round(ac3.budget_acquired, 350)
-    assert_round(ac4.budget_acquired, 1000 * 2 / 16 + 275 * 2 / 6)
-    assert_round(ac5.budget_acquired, 1000 / 16 + 275 / 6)
+    acs = (ac1, ac2, ac3, ac4, ac5)
+    planning = BasePlanningWeightedMonthlyContribution(acs, 328.64, 1000, today)
+
+    def setup():
+        # start every round from the start budgets instead of the previous round's result
+        planning.reset()
+
+    benchmark.pedantic(planning.calculate_acquired_budgets, setup=setup, rounds=100)
+    assert_budgets(acs, _EXPECTED_COMPLEX)
     assert _sum_start_budgets(*acs) == 50
-    assert _sum_acquired_budgets(*acs) == 1000 + 328.64 + 50
+    assert planning.total_acquired_budget == 1000 + 328.64 + 50
 
 
 # dated sequential acquisition
-def test_dsaplanning():
-    ac1 = BaseAcquisition(
-        name="test1",
-        start_budget=50,
-        target_budget=200,
-        start_date=date(2022, 12, 1),
-        target_date=None, weight=1,
-    )
-    ac2 = BaseAcquisition(
-        name="test2",
-        start_budget=100,
-        target_budget=500,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=3,
-    )
-    ac3 = BaseAcquisition(
-        name="test3",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=2,
-    )
-    today = date(2023, 3, 15)
-    planning = BasePlanningDatedSequentialAcquisition(
-        acquisitions=[ac1, ac2, ac3],
-        monthly_budget=100,
-        start_budget=100,
-        today=today,
-    )
-    planning.calculate_acquired_budgets()
-    assert ac1.budget_acquired == 200
-    assert ac2.budget_acquired == 450
-    assert ac3.budget_acquired == 0
-    assert ac1.start_budget == 50
-    assert ac2.start_budget == 100
-    assert ac3.start_budget == 0
+def test_dsaplanning(make_ac):
+    ac1 = make_ac(name="test1", start_budget=50, target_budget=200, start_date=date(2022, 12, 1))
+    ac2 = make_ac(name="test2", start_budget=100, target_budget=500, weight=3)
+    ac3 = make_ac(name="test3", weight=2)
+    planning = BasePlanningDatedSequentialAcquisition((ac1, ac2, ac3), 100, 100)
+    planning.calculate_acquired_budgets()
+    assert (ac1.budget_acquired, ac2.budget_acquired, ac3.budget_acquired) == (200, 450, 0)
+    assert (ac1.start_budget, ac2.start_budget, ac3.start_budget) == (50, 100, 0)
+    start_budget1, start_budget2, start_budget3 = (ac1.start_budget, ac2.start_budget,
+                                                   ac3.start_budget)
+    planning_start_budget = planning.start_budget
     assert (
             _sum_acquired_budgets(ac1, ac2)
-            == ac1.start_budget
-            + ac2.start_budget
-            + ac3.start_budget
-            + planning.start_budget
-            + 100 * 4
+            == start_budget1 + start_budget2 + start_budget3 + planning_start_budget + 100 * 4
     )
 
 
-def test_dsaplanning_get_acquisition_sequence():
-    a1 = ac("b", 1000, 1, 1)
-    a2 = ac("c", 1000, 1, 1)
-    a3 = ac("a", 1000, 1, 1)
-    a4 = ac("b", 750, 1, 1)
-    a5 = ac("b", 1250, 1, 1)
-    a6 = ac("b", 1000, 2, 1)
-    a7 = ac("b", 1000, 0, 1)
-    a8 = ac("b", 1000, 1, 0)
-    a9 = ac("b", 1000, 1, 2)
-    a10 = ac("a", 750, 2, 2)
-
-    expected = [a8, a6, a4, a3, a1, a2, a5, a7, a10, a9]
-    planning = BasePlanningDatedSequentialAcquisition(
-        [a1, a2, a3, a4, a5, a6, a7, a8, a9, a10], 0, 0
-    )
-    result = planning.get_acquisition_sequence()
-    assert result == expected
+# (name, target_budget, weight, days) for `ac`
+_TEN_ACQUISITIONS_PARAMS = [("b", 1000, 1, 1), ("c", 1000, 1, 1), ("a", 1000, 1, 1),
+                            ("b", 750, 1, 1), ("b", 1250, 1, 1), ("b", 1000, 2, 1),
+                            ("b", 1000, 0, 1), ("b", 1000, 1, 0), ("b", 1000, 1, 2),
+                            ("a", 750, 2, 2)]
 
 
-# weighted sequential acquisition
-def test_wsaplanning_get_acquisition_sequence():
-    a1 = ac("b", 1000, 1, 1)
-    a2 = ac("c", 1000, 1, 1)
-    a3 = ac("a", 1000, 1, 1)
-    a4 = ac("b", 750, 1, 1)
-    a5 = ac("b", 1250, 1, 1)
-    a6 = ac("b", 1000, 2, 1)
-    a7 = ac("b", 1000, 0, 1)
-    a8 = ac("b", 1000, 1, 0)
-    a9 = ac("b", 1000, 1, 2)
-    a10 = ac("a", 750, 2, 2)
-
-    expected = [a10, a6, a4, a8, a3, a1, a2, a9, a5, a7]
-    planning = BasePlanningWeightedSequentialAcquisition(
-        [a1, a2, a3, a4, a5, a6, a7, a8, a9, a10], 0, 0
-    )
+@pytest.fixture(scope="module")
+def ten_acquisitions():
+    acquisitions = tuple(ac(*params) for params in _TEN_ACQUISITIONS_PARAMS)
+    yield acquisitions
+    # shared between tests, so sorting them must not have touched their budgets
+    assert all(a.budget_acquired == 0 for a in acquisitions)
+
+
+# expected order as 1-based positions in `_TEN_ACQUISITIONS_PARAMS`
+@pytest.mark.parametrize("planning_class, expected_order", [
+    pytest.param(BasePlanningDatedSequentialAcquisition, (8, 6, 4, 3, 1, 2, 5, 7, 10, 9),
+                 id="dated"),
+    pytest.param(BasePlanningWeightedSequentialAcquisition, (10, 6, 4, 8, 3, 1, 2, 9, 5, 7),
+                 id="weighted"),
+])
+def test_get_acquisition_sequence(ten_acquisitions, planning_class, expected_order):
+    planning = planning_class(ten_acquisitions, 0, 0)
     result = planning.get_acquisition_sequence()
-    assert result == expected
+    assert result == [ten_acquisitions[i - 1] for i in expected_order]
 
 
-def test_wsaplanning():
-    ac1 = BaseAcquisition(
-        name="test1",
-        start_budget=50,
-        target_budget=150,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    ac2 = BaseAcquisition(
-        name="test2",
-        start_budget=100,
-        target_budget=150,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=3,
-    )
-    ac3 = BaseAcquisition(
-        name="test3",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=2,
-    )
-    today = date(2023, 3, 15)
-    planning = BasePlanningWeightedSequentialAcquisition(
-        acquisitions=[ac1, ac2, ac3],
-        monthly_budget=30,
-        start_budget=0,
-        today=today,
-    )
+# weighted sequential acquisition
+def test_wsaplanning(make_ac):
+    ac1 = make_ac(name="test1", start_budget=50, target_budget=150)
+    ac2 = make_ac(name="test2", start_budget=100, target_budget=150, weight=3)
+    ac3 = make_ac(name="test3", weight=2)
+    planning = BasePlanningWeightedSequentialAcquisition((ac1, ac2, ac3), 30, 0)
     planning.calculate_acquired_budgets()
-    assert ac1.budget_acquired == 50
-    assert ac2.budget_acquired == 150
-    assert ac3.budget_acquired == 40
-    assert _sum_acquired_budgets(ac1, ac2, ac3) == 30 * 3 + 150
-
-
-def test_egalitarian_distribution():
-    ac1 = BaseAcquisition(
-        name="test1",
-        start_budget=50,
-        target_budget=90,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    ac2 = BaseAcquisition(
-        name="test2",
-        start_budget=0,
-        target_budget=500,
-        start_date=date(2023, 2, 1),
-        target_date=None, weight=2,
-    )
-    ac3 = BaseAcquisition(
-        name="test3",
-        start_budget=0,
-        target_budget=100,
-        start_date=date(2023, 3, 1),
-        target_date=None, weight=3,
-    )
-    today = date(2023, 3, 15)
-    planning = BasePlanningEgalitarianDistribution(
-        acquisitions=[ac1, ac2, ac3],
-        monthly_budget=30,
-        start_budget=60,
-        today=today,
-    )
+    assert (ac1.budget_acquired, ac2.budget_acquired, ac3.budget_acquired) == (50, 150, 40)
+    assert planning.total_acquired_budget == 30 * 3 + 150
+
+
+def test_egalitarian_distribution(make_ac):
+    ac1 = make_ac(name="test1", start_budget=50, target_budget=90)
+    ac2 = make_ac(name="test2", target_budget=500, start_date=_D_20230201, weight=2)
+    ac3 = make_ac(name="test3", start_date=_D_20230301, weight=3)
+    planning = BasePlanningEgalitarianDistribution((ac1, ac2, ac3), 30, 60)
     planning.calculate_acquired_budgets()
 
-    assert_round(ac1.budget_acquired, 90)
-    assert_round(ac2.budget_acquired, 55)
-    assert_round(ac3.budget_acquired, 55)
+    assert_budgets((ac1, ac2, ac3), (90, 55, 55))
 
 
-def test_egalitarian_distribution_2():
-    ac1 = BaseAcquisition(
-        name="test1",
-        start_budget=50,
-        target_budget=60,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    ac2 = BaseAcquisition(
-        name="test2",
-        start_budget=0,
-        target_budget=20,
-        start_date=date(2023, 2, 1),
-        target_date=None, weight=2,
-    )
-    ac3 = BaseAcquisition(
-        name="test3",
-        start_budget=0,
-        target_budget=30,
-        start_date=date(2023, 3, 1),
-        target_date=None, weight=3,
-    )
-    today = date(2023, 3, 15)
-    planning = BasePlanningEgalitarianDistribution(
-        acquisitions=[ac1, ac2, ac3],
-        monthly_budget=30,
-        start_budget=60,
-        today=today,
-    )
+def test_egalitarian_distribution_2(make_ac):
+    ac1 = make_ac(name="test1", start_budget=50, target_budget=60)
+    ac2 = make_ac(name="test2", target_budget=20, start_date=_D_20230201, weight=2)
+    ac3 = make_ac(name="test3", target_budget=30, start_date=_D_20230301, weight=3)
+    planning = BasePlanningEgalitarianDistribution((ac1, ac2, ac3), 30, 60)
     planning.calculate_acquired_budgets()
 
-    assert_round(ac1.budget_acquired, 60)
-    assert_round(ac2.budget_acquired, 20)
-    assert_round(ac3.budget_acquired, 30)
+    assert_budgets((ac1, ac2, ac3), (60, 20, 30))
 
 
-def test_acquisition_does_not_request_budget_when_weight_is_0():
-    ac1 = BaseAcquisition(
-        name="test1",
-        start_budget=50,
-        target_budget=60,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    assert ac1.request_budget(date(2023, 1, 1)) == 10
-
-    ac2 = BaseAcquisition(
-        name="test2",
-        start_budget=50,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=0,
-    )
-    assert ac2.request_budget(date(2024, 1, 1)) == 0
+def test_acquisition_does_not_request_budget_when_weight_is_0(make_ac):
+    ac1 = make_ac(name="test1", start_budget=50, target_budget=60)
+    assert ac1.request_budget(_D_20230101) == 10
 
+    ac2 = make_ac(name="test2", start_budget=50, weight=0)
+    assert ac2.request_budget(_D_20240101) == 0
 
-def test_acquisition_does_not_request_budget_before_start_date():
-    ac1 = BaseAcquisition(
-        name="test1",
-        start_budget=50,
-        target_budget=60,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
+
+def test_acquisition_does_not_request_budget_before_start_date(make_ac):
+    ac1 = make_ac(name="test1", start_budget=50, target_budget=60)
     assert ac1.request_budget(date(2022, 12, 1)) == 0
 
-    ac2 = BaseAcquisition(
-        name="test2",
-        start_budget=50,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
-    assert ac2.request_budget(date(2023, 1, 1)) == 50
+    ac2 = make_ac(name="test2", start_budget=50)
+    assert ac2.request_budget(_D_20230101) == 50
 
 
-def test_acquisition_does_request_budget_when_no_current_date_is_given():
-    ac1 = BaseAcquisition(
-        name="test1",
-        start_budget=50,
-        target_budget=60,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=1,
-    )
+def test_acquisition_does_request_budget_when_no_current_date_is_given(make_ac):
+    ac1 = make_ac(name="test1", start_budget=50, target_budget=60)
     assert ac1.request_budget() == 10
 
-    ac2 = BaseAcquisition(
-        name="test2",
-        start_budget=50,
-        target_budget=100,
-        start_date=date(2023, 1, 1),
-        target_date=None, weight=2,
-    )
+    ac2 = make_ac(name="test2", start_budget=50, weight=2)
     assert ac2.request_budget() == 50
 
 
@@ -883,448 +334,259 @@ def test_planning_does_not_allocate_to_acquisitions_with_weight_0():
     a3 = ac("c", 1000, 0, 3)
     a4 = ac("d", 1000, 5, 1)
 
-    planning = BasePlanningEgalitarianDistribution([a1, a2, a3, a4], 90, 0, date(2023, 2, 1))
-    planning.calculate_acquired_budgets()
-
-    assert a1.budget_acquired == 30
-    assert a2.budget_acquired == 30
-    assert a3.budget_acquired == 0
-    assert a4.budget_acquired == 30
-
-
-def test_target_date_planning():
-    a1 = ac("a", 1200, 1, 0, date(2023, 12, 31))
-    a2 = ac("b", 1200, 1, 0, date(2024, 12, 31))
-
-    planning = BasePlanningTargetDate([a1, a2], 200, 0, date(2023, 12, 31))
-    planning.calculate_acquired_budgets()
-
-    assert a1.budget_acquired == 1200
-    assert a2.budget_acquired == 600
-
-    reset(a1, a2)
-
-    planning.today = date(2025, 1, 1)
+    planning = BasePlanningEgalitarianDistribution((a1, a2, a3, a4), 90, 0, _D_20230201)
     planning.calculate_acquired_budgets()
 
-    assert a1.budget_acquired == 1200
-    assert a2.budget_acquired == 1200
-
-
-def test_target_date_planning_2():
-    a1 = BaseAcquisition(
-        name="a",
-        start_budget=600,
-        target_budget=1200,
-        start_date=date(2023, 1, 1),
-        target_date=date(2024, 1, 1),
-        weight=1
-    )
-    a2 = BaseAcquisition(
-        name="b",
-        start_budget=0,
-        target_budget=1200,
-        start_date=date(2023, 1, 1),
-        target_date=date(2024, 1, 1),
-        weight=3
-    )
-    a3 = BaseAcquisition(
-        name="c",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 1, 1),
-        target_date=None,
-        weight=4
-    )
-    a4 = BaseAcquisition(
-        name="d",
-        start_budget=0,
-        target_budget=1000,
-        start_date=date(2023, 1, 1),
-        target_date=None,
-        weight=5
-    )
-
-    planning = BasePlanningTargetDate([a1, a2, a3, a4], 200, 0, date(2023, 6, 15))
-    planning.calculate_acquired_budgets()
-
-    assert_round(a1.budget_acquired, 600)
-    assert_round(a2.budget_acquired, 0)
-    assert_round(a3.budget_acquired, 533.33)
-    assert_round(a4.budget_acquired, 666.67)
-
-    reset(a1, a2, a3, a4)
-
-    planning.today = date(2023, 12, 31)
-    planning.calculate_acquired_budgets()
-
-    assert_round(a1.budget_acquired, 600)
-    assert_round(a2.budget_acquired, 800)
-    assert_round(a3.budget_acquired, 600)
-    assert_round(a4.budget_acquired, 1000)
-
-
-def test_target_date_planning_3():
-    def reset_acquisitions():
-        reset(a1, a2, a3, a4)
-
-    a1 = BaseAcquisition(
-        name="a",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 1, 1),
-        target_date=date(2023, 12, 31),
-        weight=1
-    )
-    a2 = BaseAcquisition(
-        name="b",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 1, 1),
-        target_date=date(2023, 12, 31),
-        weight=2
-    )
-    a3 = BaseAcquisition(
-        name="c",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 1, 1),
-        target_date=None,
-        weight=1
-    )
-    a4 = BaseAcquisition(
-        name="d",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 1, 1),
-        target_date=None,
-        weight=2
-    )
-
-    planning = BasePlanningTargetDate([a1, a2, a3, a4], 200, 0, date(2023, 3, 15))
-
-    assert planning.immediate_allocation_required(planning.acquisitions, date(2023, 1, 1)) == (
+    assert (
+        a1.budget_acquired, a2.budget_acquired, a3.budget_acquired, a4.budget_acquired
+    ) == (30, 30, 0, 30)
+
+
+# (today, expected budgets) to compute the planning at; None stands for the default today
+@pytest.mark.parametrize("acquisitions_spec, monthly_budget, start_budget, schedule", [
+    pytest.param(
+        [dict(name="a", target_budget=1200, target_date=_D_20231231),
+         dict(name="b", target_budget=1200, target_date=date(2024, 12, 31))],
+        200, 0,
+        [(_D_20231231, (1200, 600)), (date(2025, 1, 1), (1200, 1200))],
+        id="reaches_target_budgets"),
+    pytest.param(
+        [dict(name="a", start_budget=600, target_budget=1200, target_date=_D_20240101),
+         dict(name="b", target_budget=1200, target_date=_D_20240101, weight=3),
+         dict(name="c", target_budget=600, weight=4),
+         dict(name="d", target_budget=1000, weight=5)],
+        200, 0,
+        [(_D_20230615, (600, 0, 533.33, 666.67)), (_D_20231231, (600, 800, 600, 1000))],
+        id="start_budget_and_weights"),
+    pytest.param(
+        [dict(name="a", target_budget=600, target_date=_D_20231231),
+         dict(name="b", target_budget=600, target_date=_D_20231231, weight=2),
+         dict(name="c", target_budget=600),
+         dict(name="d", target_budget=600, weight=2)],
+        200, 0,
+        [(None, (0, 0, 200, 400)), (_D_20230615, (0, 0, 600, 600)),
+         (date(2023, 9, 15), (150, 450, 600, 600)), (_D_20231231, (600, 600, 600, 600))],
+        id="without_target_dates_first"),
+    pytest.param(
+        [dict(name="a", target_budget=600, target_date=_D_20231231),
+         dict(name="b", target_budget=600, start_date=date(2023, 7, 1),
+              target_date=_D_20231231, weight=2),
+         dict(name="c", target_budget=600)],
+        200, 0,
+        [(None, (0, 0, 600)), (_D_20230615, (300, 0, 600)),
+         (date(2023, 7, 15), (350, 100, 600))],
+        id="later_start_date"),
+    pytest.param(
+        [dict(name="a", target_budget=600, target_date=_D_20231231),
+         dict(name="b", target_budget=600),
+         dict(name="c", target_budget=600, start_date=None)],
+        200, 0,
+        [(None, (0, 300, 300)), (_D_20230615, (0, 600, 600)),
+         (date(2023, 9, 15), (450, 600, 600))],
+        id="without_start_date"),
+    pytest.param(
+        [dict(name="a", target_budget=600, start_date=date(2022, 12, 30)),
+         dict(name="b", target_budget=600, start_date=_D_20230115, weight=2)],
+        300, 60,
+        [(date(2023, 1, 25), (120, 240)), (date(2023, 2, 15), (220, 440))],
+        id="mid_month_start_dates"),
+])
+def test_target_date_planning(make_ac, acquisitions_spec, monthly_budget, start_budget,
+                              schedule):
+    acquisitions = tuple(make_ac(**spec) for spec in acquisitions_spec)
+    planning = BasePlanningTargetDate(acquisitions, monthly_budget, start_budget)
+    for today, expected in schedule:
+        assert planning.compute_at(today or planning.today) == pytest.approx(expected, abs=0.005)
+    assert planning.total_acquired_budget == sum(spec.get("start_budget", 0)
+                                                 for spec in acquisitions_spec)
+
+
+def test_target_date_planning_immediate_allocation_required(make_ac):
+    a1 = make_ac(name="a", target_budget=600, target_date=_D_20231231)
+    a2 = make_ac(name="b", target_budget=600, target_date=_D_20231231, weight=2)
+    a3 = make_ac(name="c", target_budget=600)
+    a4 = make_ac(name="d", target_budget=600, weight=2)
+
+    planning = BasePlanningTargetDate((a1, a2, a3, a4), 200, 0)
+
+    assert planning.immediate_allocation_required(planning.acquisitions, _D_20230101) == (
         1200, [a3, a4])
 
-    planning.calculate_acquired_budgets()
 
-    assert_round(a1.budget_acquired, 0)
-    assert_round(a2.budget_acquired, 0)
-    assert_round(a3.budget_acquired, 200)
-    assert_round(a4.budget_acquired, 400)
+def test_target_date_planning_no_negative_allocation(make_ac):
+    a1 = make_ac(name="a", target_budget=600, target_date=_D_20240101)
+    a2 = make_ac(name="b", target_budget=600, weight=2)
 
-    reset_acquisitions()
-    planning.today = date(2023, 6, 15)
+    planning = BasePlanningTargetDate((a1, a2), 0, -100)
     planning.calculate_acquired_budgets()
 
-    assert_round(a1.budget_acquired, 0)
-    assert_round(a2.budget_acquired, 0)
-    assert_round(a3.budget_acquired, 600)
-    assert_round(a4.budget_acquired, 600)
-
-    reset_acquisitions()
-    planning.today = date(2023, 9, 15)
-    planning.calculate_acquired_budgets()
+    assert_budgets((a1, a2), (0, 0))
 
-    assert_round(a1.budget_acquired, 150)
-    assert_round(a2.budget_acquired, 450)
-    assert_round(a3.budget_acquired, 600)
-    assert_round(a4.budget_acquired, 600)
 
-    reset_acquisitions()
-    planning.today = date(2023, 12, 31)
-    planning.calculate_acquired_budgets()
-
-    assert_round(a1.budget_acquired, 600)
-    assert_round(a2.budget_acquired, 600)
-    assert_round(a3.budget_acquired, 600)
-    assert_round(a4.budget_acquired, 600)
-
-
-def test_target_date_planning_4():
-    a1 = BaseAcquisition(
-        name="a",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 1, 1),
-        target_date=date(2023, 12, 31),
-        weight=1
-    )
-    a2 = BaseAcquisition(
-        name="b",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 7, 1),
-        target_date=date(2023, 12, 31),
-        weight=2
-    )
-    a3 = BaseAcquisition(
-        name="c",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 1, 1),
-        target_date=None,
-        weight=1
-    )
+def test_target_date_planning_6():
+    a1 = BaseAcquisition("A", 0, 750, _D_20230515, date(2024, 5, 1), 1)
+    a2 = BaseAcquisition("B", 0, 120, _D_20230515, date(2023, 10, 1), 2)
+    a3 = BaseAcquisition("C", 0, 130, None, None, 6)
+    a4 = BaseAcquisition("D", 0, 120, None, None, 0)
+    a5 = BaseAcquisition("E", 0, 55, None, None, 5)
+    a6 = BaseAcquisition("F", 0, 20, None, None, 5)
+    a7 = BaseAcquisition("G", 0, 55, None, None, 5)
+    a8 = BaseAcquisition("H", 0, 35, None, None, 5)
+    a9 = BaseAcquisition("I", 0, 35, None, None, 5)
+    a10 = BaseAcquisition("J", 0, 15, None, None, 5)
+    a11 = BaseAcquisition("K", 0, 25, None, None, 5)
+    a12 = BaseAcquisition("L", 0, 10, None, None, 5)
+    a13 = BaseAcquisition("M", 0, 10, None, None, 5)
+    a14 = BaseAcquisition("N", 0, 15, None, None, 5)
+    a15 = BaseAcquisition("O", 0, 220.32, date(2023, 6, 21), _D_20240101, 10)
+    acquisitions = (a1, a2, a3, a4, a5, a6, a7, a8, a9, a10, a11, a12, a13, a14, a15)
 
-    planning = BasePlanningTargetDate([a1, a2, a3], 200, 0, date(2023, 3, 15))
+    planning = BasePlanningTargetDate(acquisitions, 203.1, 455.66, date(2023, 6, 25), 26)
     planning.calculate_acquired_budgets()
 
-    assert_round(a1.budget_acquired, 0)
-    assert_round(a2.budget_acquired, 0)
-    assert_round(a3.budget_acquired, 600)
+    assert_budgets(acquisitions, (62.5, 24, 130, 0, 55, 20, 55, 35, 35, 15, 25, 10, 10, 15, 0))
 
-    reset(a1, a2, a3)
-    planning.today = date(2023, 6, 15)
-    planning.calculate_acquired_budgets()
 
-    assert_round(a1.budget_acquired, 300)
-    assert_round(a2.budget_acquired, 0)
-    assert_round(a3.budget_acquired, 600)
+def test_target_date_planning_7():
+    a1 = BaseAcquisition("A", 0, 750, _D_20230515, date(2024, 5, 1), 1)
+    a2 = BaseAcquisition("B", 0, 120, _D_20230515, date(2023, 10, 1), 2)
+    a3 = BaseAcquisition("C", 0, 350, None, None, 10)
+    a4 = BaseAcquisition("D", 0, 350, date(2023, 5, 26), _D_20240101, 10)
 
-    reset(a1, a2, a3)
-    planning.today = date(2023, 7, 15)
+    acquisitions = (a1, a2, a3, a4)
+    planning = BasePlanningTargetDate(acquisitions, 200, 500, date(2023, 7, 29), 25)
     planning.calculate_acquired_budgets()
 
-    assert_round(a1.budget_acquired, 350)
-    assert_round(a2.budget_acquired, 100)
-    assert_round(a3.budget_acquired, 600)
 
+def test_get_earliest_planning_date(make_ac):
+    a1 = make_ac(name="a", target_budget=600, target_date=_D_20240101)
+    a2 = make_ac(name="b", target_budget=600, start_date=_D_20230115)
+    a3 = make_ac(name="c", target_budget=600, start_date=date(2023, 2, 10))
+    planning = BasePlanning((a1, a2), 0, 0)
+    assert planning.get_earliest_planning_date() == _D_20230101
 
-def test_target_date_planning_5():
-    a1 = BaseAcquisition(
-        name="a",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 1, 1),
-        target_date=date(2023, 12, 31),
-        weight=1
-    )
-    a2 = BaseAcquisition(
-        name="b",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 1, 1),
-        target_date=None,
-        weight=1
-    )
-    a3 = BaseAcquisition(
-        name="c",
-        start_budget=0,
-        target_budget=600,
-        start_date=None,
-        target_date=None,
-        weight=1
-    )
+    planning = BasePlanning((a2, a3), 0, 0)
+    assert planning.get_earliest_planning_date() == _D_20230201
 
-    def reset_acqs():
-        reset(a1, a2, a3)
 
-    planning = BasePlanningTargetDate([a1, a2, a3], 200, 0, date(2023, 3, 15))
+def test_planning_totals(make_ac):
+    a1 = make_ac(name="a", start_budget=20, target_budget=100)
+    a2 = make_ac(name="b", target_budget=250, weight=2)
+    planning = BasePlanningWeightedMonthlyContribution((a1, a2), 30, 0)
+    assert planning.total_target_budget == 350
+    assert planning.total_acquired_budget == 20
     planning.calculate_acquired_budgets()
+    assert planning.total_acquired_budget == 20 + 30 * 3
+    a2.target_budget = 500
+    assert planning.total_target_budget == 600
 
-    assert_round(a1.budget_acquired, 0)
-    assert_round(a2.budget_acquired, 300)
-    assert_round(a3.budget_acquired, 300)
 
-    reset_acqs()
-    planning.today = date(2023, 6, 15)
+def test_planning_snapshot_restore(make_ac):
+    a1 = make_ac(name="a", start_budget=20, target_budget=100)
+    a2 = make_ac(name="b", target_budget=250, weight=2)
+    planning = BasePlanningWeightedMonthlyContribution((a1, a2), 30, 0)
     planning.calculate_acquired_budgets()
-
-    assert_round(a1.budget_acquired, 0)
-    assert_round(a2.budget_acquired, 600)
-    assert_round(a3.budget_acquired, 600)
-
-    reset_acqs()
-    planning.today = date(2023, 9, 15)
+    planning.restore()  # nothing snapshotted yet: back to the start budgets
+    assert (a1.budget_acquired, a2.budget_acquired) == (20, 0)
     planning.calculate_acquired_budgets()
-
-    assert_round(a1.budget_acquired, 450)
-    assert_round(a2.budget_acquired, 600)
-    assert_round(a3.budget_acquired, 600)
-
-
-def test_target_date_planning_mid_month_start_dates():
-    a1 = BaseAcquisition(
-        name="a",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2022, 12, 30),
-        target_date=None,
-        weight=1
-    )
-    a2 = BaseAcquisition(
-        name="b",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 1, 15),
-        target_date=None,
-        weight=2
-    )
-
-    planning = BasePlanningTargetDate([a1, a2], 300, 60, date(2023, 1, 25))
-    planning.calculate_acquired_budgets()
-
-    assert_round(a1.budget_acquired, 120)
-    assert_round(a2.budget_acquired, 240)
-
-    reset(a1, a2)
-    planning.today = date(2023, 2, 15)
+    assert planning.snapshot() == (50, 60)
     planning.calculate_acquired_budgets()
+    planning.restore()
+    assert (a1.budget_acquired, a2.budget_acquired) == (50, 60)
+    with pytest.raises(ValueError):
+        planning.restore((50,))
 
-    assert_round(a1.budget_acquired, 220)
-    assert_round(a2.budget_acquired, 440)
-
-
-def test_target_date_planning_no_negative_allocation():
-    a1 = BaseAcquisition(
-        name="a",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 1, 1),
-        target_date=date(2024, 1, 1),
-        weight=1
-    )
-    a2 = BaseAcquisition(
-        name="b",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 1, 1),
-        target_date=None,
-        weight=2
-    )
 
-    planning = BasePlanningTargetDate([a1, a2], 0, -100, date(2023, 3, 15))
+def test_planning_reset(make_ac):
+    a1 = make_ac(name="a", start_budget=20, target_budget=100)
+    a2 = make_ac(name="b", target_budget=250, weight=2)
+    planning = BasePlanningWeightedMonthlyContribution((a1, a2), 30, 0)
     planning.calculate_acquired_budgets()
-
-    assert_round(a1.budget_acquired, 0)
-    assert_round(a2.budget_acquired, 0)
+    planning.reset()
+    assert (a1.budget_acquired, a2.budget_acquired) == (20, 0)
 
 
-def test_target_date_planning_6():
-    a1 = BaseAcquisition("A", 0, 750, date(2023, 5, 15), date(2024, 5, 1), 1)
-    a2 = BaseAcquisition("B", 0, 120, date(2023, 5, 15), date(2023, 10, 1), 2)
-    a3 = BaseAcquisition("C", 0, 130, None, None, 6)
-    a4 = BaseAcquisition("D", 0, 120, None, None, 0)
-    a5 = BaseAcquisition("E", 0, 55, None, None, 5)
-    a6 = BaseAcquisition("F", 0, 20, None, None, 5)
-    a7 = BaseAcquisition("G", 0, 55, None, None, 5)
-    a8 = BaseAcquisition("H", 0, 35, None, None, 5)
-    a9 = BaseAcquisition("I", 0, 35, None, None, 5)
-    a10 = BaseAcquisition("J", 0, 15, None, None, 5)
-    a11 = BaseAcquisition("K", 0, 25, None, None, 5)
-    a12 = BaseAcquisition("L", 0, 10, None, None, 5)
-    a13 = BaseAcquisition("M", 0, 10, None, None, 5)
-    a14 = BaseAcquisition("N", 0, 15, None, None, 5)
-    a15 = BaseAcquisition("O", 0, 220.32, date(2023, 6, 21), date(2024, 1, 1), 10)
-    acquisitions = [a1, a2, a3, a4, a5, a6, a7, a8, a9, a10, a11, a12, a13, a14, a15]
-
-    planning = BasePlanningTargetDate(acquisitions, 203.1, 455.66, date(2023, 6, 25), 26)
+@pytest.mark.parametrize("planning_class, expected", [
+    pytest.param(BasePlanningWeightedMonthlyContribution, (400, 800), id="wmc"),
+    pytest.param(BasePlanningTargetDate, (0, 1200), id="target_date"),
+])
+def test_planning_compute_at_ignores_previous_allocations(make_ac, planning_class, expected):
+    a1 = make_ac(name="a", target_budget=6000, target_date=_D_20240101)
+    a2 = make_ac(name="b", target_budget=6000, weight=2)
+    planning = planning_class((a1, a2), 200, 0)
+    assert planning.compute_at(_D_20230615) == pytest.approx(expected)
     planning.calculate_acquired_budgets()
-
-    assert_round(a1.budget_acquired, 62.5)
-    assert_round(a2.budget_acquired, 24)
-    assert_round(a3.budget_acquired, 130)
-    assert_round(a4.budget_acquired, 0)
-    assert_round(a5.budget_acquired, 55)
-    assert_round(a6.budget_acquired, 20)
-    assert_round(a7.budget_acquired, 55)
-    assert_round(a8.budget_acquired, 35)
-    assert_round(a9.budget_acquired, 35)
-    assert_round(a10.budget_acquired, 15)
-    assert_round(a11.budget_acquired, 25)
-    assert_round(a12.budget_acquired, 10)
-    assert_round(a13.budget_acquired, 10)
-    assert_round(a14.budget_acquired, 15)
-    assert_round(a15.budget_acquired, 0)
+    allocated = (a1.budget_acquired, a2.budget_acquired)
+    assert planning.compute_at(_D_20230615) == pytest.approx(expected)
+    assert (a1.budget_acquired, a2.budget_acquired) == allocated
+    assert planning.today == _D_20230315
 
 
-def test_target_date_planning_7():
-    a1 = BaseAcquisition("A", 0, 750, date(2023, 5, 15), date(2024, 5, 1), 1)
-    a2 = BaseAcquisition("B", 0, 120, date(2023, 5, 15), date(2023, 10, 1), 2)
-    a3 = BaseAcquisition("C", 0, 350, None, None, 10)
-    a4 = BaseAcquisition("D", 0, 350, date(2023, 5, 26), date(2024, 1, 1), 10)
+def test_target_date_planning_picks_up_changed_target_date(make_ac):
+    a1 = make_ac(target_budget=600, target_date=_D_20231231)
+    planning = BasePlanningTargetDate((a1,), 200, 0)
+    assert planning.compute_at(_D_20230615) == (300,)
+    a1.target_date = date(2023, 6, 30)
+    assert planning.compute_at(_D_20230615) == (600,)
 
-    acquisitions = [a1, a2, a3, a4]
-    planning = BasePlanningTargetDate(acquisitions, 200, 500, date(2023, 7, 29), 25)
-    planning.calculate_acquired_budgets()
-
-
-def test_get_earliest_planning_date():
-    a1 = BaseAcquisition(
-        name="a",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 1, 1),
-        target_date=date(2024, 1, 1),
-        weight=1
-    )
-    a2 = BaseAcquisition(
-        name="b",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 1, 15),
-        target_date=None,
-        weight=1
-    )
-    a3 = BaseAcquisition(
-        name="c",
-        start_budget=0,
-        target_budget=600,
-        start_date=date(2023, 2, 10),
-        target_date=None,
-        weight=1
-    )
-    planning = BasePlanning([a1, a2], 0, 0, date(2023, 3, 15))
-    assert planning.get_earliest_planning_date() == date(2023, 1, 1)
 
-    planning = BasePlanning([a2, a3], 0, 0, date(2023, 3, 15))
-    assert planning.get_earliest_planning_date() == date(2023, 2, 1)
+def test_planning_fresh_restores_today(make_ac):
+    planning = BasePlanningTargetDate((make_ac(),), 200, 0)
+    with planning.fresh():
+        planning.today = _D_20231231
+        planning.calculate_acquired_budgets()
+    assert planning.today == _D_20230315
+    assert planning.acquisitions[0].budget_acquired == 0
 
 
 def test_get_next_planning_date_first_of_month():
-    assert _get_next_planning_date(date(2023, 1, 1), 1) == date(2023, 2, 1)
-    assert _get_next_planning_date(date(2023, 1, 15), 1) == date(2023, 2, 1)
-    assert _get_next_planning_date(date(2023, 1, 31), 1) == date(2023, 2, 1)
-    assert _get_next_planning_date(date(2023, 2, 1), 1) == date(2023, 3, 1)
-    assert _get_next_planning_date(date(2023, 2, 28), 1) == date(2023, 3, 1)
+    assert _get_next_planning_date(_D_20230101, 1) == _D_20230201
+    assert _get_next_planning_date(_D_20230115, 1) == _D_20230201
+    assert _get_next_planning_date(_D_20230131, 1) == _D_20230201
+    assert _get_next_planning_date(_D_20230201, 1) == _D_20230301
+    assert _get_next_planning_date(_D_20230228, 1) == _D_20230301
 
 
 def test_get_next_planning_date_last_of_month():
-    assert _get_next_planning_date(date(2023, 1, 1), -1) == date(2023, 1, 31)
-    assert _get_next_planning_date(date(2023, 1, 15), -1) == date(2023, 1, 31)
-    assert _get_next_planning_date(date(2023, 1, 31), -1) == date(2023, 2, 28)
-    assert _get_next_planning_date(date(2023, 2, 1), -1) == date(2023, 2, 28)
-    assert _get_next_planning_date(date(2023, 2, 28), -1) == date(2023, 3, 31)
+    assert _get_next_planning_date(_D_20230101, -1) == _D_20230131
+    assert _get_next_planning_date(_D_20230115, -1) == _D_20230131
+    assert _get_next_planning_date(_D_20230131, -1) == _D_20230228
+    assert _get_next_planning_date(_D_20230201, -1) == _D_20230228
+    assert _get_next_planning_date(_D_20230228, -1) == date(2023, 3, 31)
     assert _get_next_planning_date(date(2023, 3, 31), -1) == date(2023, 4, 30)
+    assert _get_next_planning_date(date(2024, 2, 1), -1) == date(2024, 2, 29)
+    assert _get_next_planning_date(date(2100, 2, 1), -1) == date(2100, 2, 28)
 
 
 def test_get_next_planning_20th_of_month():
-    assert _get_next_planning_date(date(2023, 1, 1), 20) == date(2023, 1, 20)
-    assert _get_next_planning_date(date(2023, 1, 15), 20) == date(2023, 1, 20)
-    assert _get_next_planning_date(date(2023, 1, 20), 20) == date(2023, 2, 20)
-    assert _get_next_planning_date(date(2023, 1, 31), 20) == date(2023, 2, 20)
-    assert _get_next_planning_date(date(2023, 2, 1), 20) == date(2023, 2, 20)
-    assert _get_next_planning_date(date(2023, 2, 19), 20) == date(2023, 2, 20)
-    assert _get_next_planning_date(date(2023, 2, 20), 20) == date(2023, 3, 20)
-    assert _get_next_planning_date(date(2023, 2, 28), 20) == date(2023, 3, 20)
+    assert _get_next_planning_date(_D_20230101, 20) == _D_20230120
+    assert _get_next_planning_date(_D_20230115, 20) == _D_20230120
+    assert _get_next_planning_date(_D_20230120, 20) == _D_20230220
+    assert _get_next_planning_date(_D_20230131, 20) == _D_20230220
+    assert _get_next_planning_date(_D_20230201, 20) == _D_20230220
+    assert _get_next_planning_date(date(2023, 2, 19), 20) == _D_20230220
+    assert _get_next_planning_date(_D_20230220, 20) == date(2023, 3, 20)
+    assert _get_next_planning_date(_D_20230228, 20) == date(2023, 3, 20)
 
 
 def test_get_next_planning_30th_of_month():
-    assert _get_next_planning_date(date(2023, 1, 1), 30) == date(2023, 1, 30)
-    assert _get_next_planning_date(date(2023, 1, 15), 30) == date(2023, 1, 30)
-    assert _get_next_planning_date(date(2023, 1, 30), 30) == date(2023, 2, 28)
-    assert _get_next_planning_date(date(2023, 1, 31), 30) == date(2023, 2, 28)
-    assert _get_next_planning_date(date(2023, 2, 1), 30) == date(2023, 2, 28)
-    assert _get_next_planning_date(date(2023, 2, 15), 30) == date(2023, 2, 28)
-    assert _get_next_planning_date(date(2023, 2, 28), 30) == date(2023, 3, 30)
+    assert _get_next_planning_date(_D_20230101, 30) == date(2023, 1, 30)
+    assert _get_next_planning_date(_D_20230115, 30) == date(2023, 1, 30)
+    assert _get_next_planning_date(date(2023, 1, 30), 30) == _D_20230228
+    assert _get_next_planning_date(_D_20230131, 30) == _D_20230228
+    assert _get_next_planning_date(_D_20230201, 30) == _D_20230228
+    assert _get_next_planning_date(date(2023, 2, 15), 30) == _D_20230228
+    assert _get_next_planning_date(_D_20230228, 30) == date(2023, 3, 30)
 
 
 def test_planning_date_count():
-    assert _planning_date_count_between(date(2023, 1, 1), date(2023, 12, 31), 1) == 12
-    assert _planning_date_count_between(date(2023, 1, 1), date(2023, 12, 31), -1) == 12
-    assert _planning_date_count_between(date(2023, 1, 1), date(2024, 1, 1), 1) == 13
-    assert _planning_date_count_between(date(2023, 3, 15), date(2023, 3, 15), 1) == 0
-    assert _planning_date_count_between(date(2023, 2, 1), date(2023, 2, 1), 1) == 1
-    assert _planning_date_count_between(date(2023, 1, 15), date(2023, 3, 15), 10) == 2
-    assert _planning_date_count_between(date(2023, 1, 31), date(2023, 3, 29), -2) == 1
+    assert _planning_date_count_between(_D_20230101, _D_20231231, 1) == 12
+    assert _planning_date_count_between(_D_20230101, _D_20231231, -1) == 12
+    assert _planning_date_count_between(_D_20230101, _D_20240101, 1) == 13
+    assert _planning_date_count_between(_D_20230315, _D_20230315, 1) == 0
+    assert _planning_date_count_between(_D_20230201, _D_20230201, 1) == 1
+    assert _planning_date_count_between(_D_20230115, _D_20230315, 10) == 2
+    assert _planning_date_count_between(_D_20230131, date(2023, 3, 29), -2) == 1
+    assert _planning_date_count_between(_D_20230115, _D_20230131, 20) == 1
+    assert _planning_date_count_between(_D_20230315, _D_20230101, 1) == 0
+    assert _planning_date_count_between(date(2022, 12, 31), date(2033, 1, 30), -1) == 121
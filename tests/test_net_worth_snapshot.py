@@ -11,3 +11,8 @@ def test_get_date_value():
 def test_get_date_value_2():
     date = datetime.date(year=1900, month=1, day=1)
     assert nws._date_value(date) == 2
+
+
+def test_get_date_value_after_phantom_leap_day():
+    date = datetime.date(year=1900, month=3, day=1)
+    assert nws._date_value(date) == 61